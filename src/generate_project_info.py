@@ -10,11 +10,31 @@ Markdownに変換し、1つのdocs/project_info.mdファイルにまとめます
 
 import os
 import sys
+import json
+import hashlib
 import argparse
-from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from markitdown import MarkItDown
 
+# 並列変換のデフォルトのプロセス数
+DEFAULT_PARALLEL = min(8, os.cpu_count() or 1)
+
+# 変換対象とするファイルの拡張子
+SUPPORTED_EXTENSIONS = frozenset({".pdf", ".pptx", ".docx", ".xlsx", ".md", ".markdown", ".txt", ".html", ".csv"})
+
+# MarkItDownで変換せず、内容をそのまま出力ファイルにコピーする拡張子
+COPY_EXTENSIONS = frozenset({".md", ".markdown"})
+
+# 変換結果のキャッシュを保存するディレクトリと、そのインデックスファイル
+CACHE_DIR = ".cache"
+CACHE_INDEX_FILE = os.path.join(CACHE_DIR, "project_info_cache.json")
+# キャッシュのインデックスの形式のバージョン（形式を変えたら上げる）
+CACHE_VERSION = 1
+
+# プロセス内で共有するMarkItDownのインスタンス（_get_converterで遅延生成する）
+_CONVERTER = None
+
 
 def parse_arguments():
     """コマンドライン引数をパースする関数
@@ -40,12 +60,28 @@ def parse_arguments():
         action="store_true",
         help="サブディレクトリを再帰的に処理しない（デフォルトは再帰的に処理する）",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        help=f"並列に変換するプロセス数（デフォルト: {DEFAULT_PARALLEL}）",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="変換結果のキャッシュを使わずにすべてのファイルを変換し直す",
+    )
+    args = parser.parse_args()
+    if args.parallel < 1:
+        parser.error("--parallel には1以上の値を指定してください")
+    return args
 
 
 def get_files(directory, recursive=True):
     """指定されたディレクトリ内のファイルを取得する関数
 
+    隠しファイル（.gitkeep、.DS_Storeなど）と、SUPPORTED_EXTENSIONSに含まれない拡張子のファイルは除外します。
+
     Args:
         directory (str): ディレクトリのパス
         recursive (bool, optional): サブディレクトリも再帰的に処理するかどうか. Defaults to True.
@@ -54,20 +90,52 @@ def get_files(directory, recursive=True):
         list: ファイルパスのリスト
     """
     files = []
-    directory_path = Path(directory)
-
-    if recursive:
-        for file_path in directory_path.glob("**/*"):
-            if file_path.is_file() and not file_path.name == ".gitkeep":
-                files.append(str(file_path))
-    else:
-        for file_path in directory_path.glob("*"):
-            if file_path.is_file() and not file_path.name == ".gitkeep":
-                files.append(str(file_path))
+    skipped = []
+    stack = [directory]
+
+    # DirEntryのis_file/is_dirはscandir時の情報を使うため、エントリごとのstatを省ける
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.startswith("."):
+                    continue
+                elif entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS:
+                        files.append(entry.path)
+                    else:
+                        skipped.append(entry.path)
+
+    if skipped:
+        print(f"警告: 対応していない形式のため、{len(skipped)}件のファイルをスキップしました: {', '.join(sorted(skipped))}")
 
     return sorted(files)
 
 
+def _get_converter():
+    """MarkItDownのインスタンスを取得する関数
+
+    生成時に各種バックエンドを読み込むため、プロセスごとに1度だけ生成して使い回します。
+
+    Returns:
+        MarkItDown: MarkItDownのインスタンス
+    """
+    global _CONVERTER
+    if _CONVERTER is None:
+        _CONVERTER = MarkItDown()
+    return _CONVERTER
+
+
+def _init_worker():
+    """ワーカープロセスを初期化する関数
+
+    最初のファイルの変換を待たずに、ワーカーの起動時にMarkItDownを生成しておきます。
+    """
+    _get_converter()
+
+
 def convert_to_markdown(file_path):
     """ファイルをMarkdownに変換する関数
 
@@ -77,30 +145,166 @@ def convert_to_markdown(file_path):
     Returns:
         str: Markdown形式のテキスト
     """
+    return _convert_in_worker(file_path)[1]
+
+
+def _convert_in_worker(file_path):
+    """ファイルをMarkdownに変換し、成功したかどうかと合わせて返す関数
+
+    Args:
+        file_path (str): ファイルのパス
+
+    Returns:
+        tuple[bool, str]: 変換に成功したかどうかと、Markdown形式のテキスト（失敗した場合は代わりに出力するテキスト）
+    """
     try:
         print(f"変換中: {file_path}")
 
-        # MDファイルの場合は、直接内容を読み込む
-        if file_path.lower().endswith(".md"):
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+        # MDファイルの場合は、コピーする場合と同じ方法で内容を読み込む
+        if os.path.splitext(file_path)[1].lower() in COPY_EXTENSIONS:
+            return True, read_text_file(file_path)
 
         # その他のファイルはMarkItDownを使用して変換
-        converter = MarkItDown()
-        result = converter.convert(file_path)
-        return result.text_content
+        result = _get_converter().convert(file_path)
+        return True, result.text_content
     except Exception as e:
         print(f"エラー: {file_path}の変換に失敗しました: {e}")
-        return f"# {os.path.basename(file_path)}\n\n*このファイルの変換に失敗しました。*\n\n"
+        return False, _failed_markdown(file_path)
+
+
+def read_text_file(file_path):
+    """変換が不要なファイルの内容を読み込む関数
+
+    UTF-8のテキストとして読み込むため、改行コード（CRLF）とBOMは正規化されます。
+
+    Args:
+        file_path (str): ファイルのパス
+
+    Returns:
+        str: ファイルの内容
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+        UnicodeDecodeError: UTF-8として読めない場合
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        return f.read()
+
+
+def copy_file_contents(out_file, file_path):
+    """変換が不要なファイルの内容を、そのまま出力ファイルに書き込む関数
+
+    UTF-8として読めないファイルは、変換に失敗したファイルとして扱います。
+
+    Args:
+        out_file (io.TextIOWrapper): 書き込み先のファイルオブジェクト
+        file_path (str): コピーするファイルのパス
+    """
+    print(f"コピー中: {file_path}")
+
+    # 途中で読み込みに失敗しても出力が壊れないよう、全体を読み込んでから書き込む
+    try:
+        content = read_text_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"エラー: {file_path}のコピーに失敗しました: {e}")
+        content = _failed_markdown(file_path)
+
+    out_file.write(content)
+
+
+def _failed_markdown(file_path):
+    """変換に失敗したファイルの代わりに出力するMarkdownを作成する関数
+
+    Args:
+        file_path (str): ファイルのパス
+
+    Returns:
+        str: Markdown形式のテキスト
+    """
+    return f"# {os.path.basename(file_path)}\n\n*このファイルの変換に失敗しました。*\n\n"
+
+
+def load_cache():
+    """変換結果のキャッシュのインデックスを読み込む関数
+
+    Returns:
+        dict: ファイルパスをキーとするキャッシュ情報の辞書（読み込めない場合や形式が異なる場合は空の辞書）
+    """
+    try:
+        with open(CACHE_INDEX_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    if not isinstance(files, dict):
+        return {}
+    for entry in files.values():
+        if not isinstance(entry, dict) or not isinstance(entry.get("md_path"), str):
+            return {}
+    return files
+
 
+def save_cache(cache):
+    """変換結果のキャッシュのインデックスを書き込む関数
 
-def generate_project_info(input_dir, output_file, recursive=True):
+    Args:
+        cache (dict): ファイルパスをキーとするキャッシュ情報の辞書
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(CACHE_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": cache}, f, ensure_ascii=False, indent=2)
+
+
+def _cache_entry_for(file_path, stat):
+    """ファイルの現在の状態に対応するキャッシュ情報を作成する関数
+
+    Args:
+        file_path (str): ファイルのパス
+        stat (os.stat_result): ファイルのstat情報
+
+    Returns:
+        dict: キャッシュ情報（更新日時、サイズ、変換結果の保存先）
+    """
+    sha1_short = hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
+    return {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha1_short": sha1_short,
+        "md_path": os.path.join(CACHE_DIR, f"{sha1_short}.md"),
+    }
+
+
+def _is_cache_hit(old_entry, new_entry):
+    """キャッシュされた変換結果をそのまま使えるかどうかを判定する関数
+
+    Args:
+        old_entry (dict): 前回のキャッシュ情報（存在しない場合はNone）
+        new_entry (dict): ファイルの現在の状態に対応するキャッシュ情報
+
+    Returns:
+        bool: 更新日時とサイズが一致し、変換結果が保存されている場合はTrue
+    """
+    return (
+        old_entry is not None
+        and old_entry.get("mtime") == new_entry["mtime"]
+        and old_entry.get("size") == new_entry["size"]
+        and old_entry.get("md_path") == new_entry["md_path"]
+        and os.path.exists(new_entry["md_path"])
+    )
+
+
+def generate_project_info(input_dir, output_file, recursive=True, parallel=DEFAULT_PARALLEL, use_cache=True):
     """プロジェクト情報を生成する関数
 
     Args:
         input_dir (str): 入力ディレクトリのパス
         output_file (str): 出力ファイルのパス
         recursive (bool, optional): サブディレクトリも再帰的に処理するかどうか. Defaults to True.
+        parallel (int, optional): 並列に変換するプロセス数. Defaults to DEFAULT_PARALLEL.
+        use_cache (bool, optional): 更新されていないファイルの変換結果をキャッシュから読み込むかどうか. Defaults to True.
 
     Returns:
         bool: 成功した場合はTrue、失敗した場合はFalse
@@ -133,23 +337,73 @@ def generate_project_info(input_dir, output_file, recursive=True):
 
 """
 
-        # 目次を作成
-        toc = ""
-        for i, file_path in enumerate(files, 1):
-            file_name = os.path.basename(file_path)
-            toc += f"{i}. [{file_name}](#{file_name.lower().replace('.', '-').replace(' ', '-')})\n"
-
-        # 各ファイルの内容を変換
-        content = ""
-        for file_path in files:
-            file_name = os.path.basename(file_path)
-            content += f"\n\n## {file_name}\n\n"
-            content += convert_to_markdown(file_path)
-            content += "\n\n---\n"
-
-        # 出力ファイルに書き込む
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(header + toc + content)
+        # Markdownファイルは変換せずにそのままコピーする
+        copy_files = {file_path for file_path in files if os.path.splitext(file_path)[1].lower() in COPY_EXTENSIONS}
+
+        # それ以外は更新日時とサイズが変わっていなければキャッシュを使い、変わったものだけを変換する
+        old_cache = load_cache()
+        cache = {
+            file_path: _cache_entry_for(file_path, os.stat(file_path)) for file_path in files if file_path not in copy_files
+        }
+        targets = [
+            file_path for file_path in cache if not (use_cache and _is_cache_hit(old_cache.get(file_path), cache[file_path]))
+        ]
+        if use_cache:
+            print(f"{len(cache) - len(targets)}件のファイルはキャッシュを使用します。")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        # 出力ファイルに順次書き込む（変換結果を1つの文字列に連結しない）
+        with open(output_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(header)
+
+            # 目次を作成
+            toc_parts = []
+            for i, file_path in enumerate(files, 1):
+                file_name = os.path.basename(file_path)
+                toc_parts.append(f"{i}. [{file_name}](#{file_name.lower().replace('.', '-').replace(' ', '-')})\n")
+            f.write("".join(toc_parts))
+
+            # 変換が必要なファイルを並列に変換（mapは入力順に結果を返す）
+            # 変換が不要な場合はワーカーを起動せず、ワーカー数も変換するファイル数までにする
+            executor = None
+            converted = iter(())
+            if targets:
+                executor = ProcessPoolExecutor(max_workers=min(parallel, len(targets)), initializer=_init_worker)
+                converted = executor.map(_convert_in_worker, targets)
+            target_set = set(targets)
+
+            try:
+                for file_path in files:
+                    file_name = os.path.basename(file_path)
+                    f.write(f"\n\n## {file_name}\n\n")
+
+                    if file_path in copy_files:
+                        copy_file_contents(f, file_path)
+                    else:
+                        md_path = cache[file_path]["md_path"]
+                        if file_path in target_set:
+                            ok, markdown = next(converted)
+                            if not ok:
+                                # 失敗した結果はキャッシュせず、次回も変換し直す
+                                del cache[file_path]
+                            else:
+                                with open(md_path, "w", encoding="utf-8") as cache_file:
+                                    cache_file.write(markdown)
+                        else:
+                            with open(md_path, "r", encoding="utf-8") as cache_file:
+                                markdown = cache_file.read()
+                        f.write(markdown)
+
+                    f.write("\n\n---\n")
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+            # 対象外になったファイルのキャッシュを削除してインデックスを更新
+            for file_path, entry in old_cache.items():
+                if file_path not in cache and os.path.exists(entry.get("md_path", "")):
+                    os.remove(entry["md_path"])
+            save_cache(cache)
 
         print(f"プロジェクト情報を {output_file} に書き出しました。")
         return True
@@ -165,7 +419,7 @@ def generate_project_info(input_dir, output_file, recursive=True):
 def main():
     """メイン関数"""
     args = parse_arguments()
-    success = generate_project_info(args.input_dir, args.output_file, not args.no_recursive)
+    success = generate_project_info(args.input_dir, args.output_file, not args.no_recursive, args.parallel, not args.no_cache)
     return 0 if success else 1
 
 
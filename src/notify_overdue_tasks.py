@@ -11,35 +11,123 @@ SlackやDiscordに通知します。環境変数の設定に応じて、どち
 
 import os
 import re
-import json
+import functools
+import mmap
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# 通知設定で有効とみなす値（小文字）
+_TRUE_VALUES = frozenset({"true", "1", "yes", "y", "on"})
 
+# Webhookを並列に送信するスレッド数
+NOTIFICATION_WORKERS = 8
+
+# Discordの1メッセージに含められるembedの最大数
+DISCORD_EMBEDS_PER_MESSAGE = 10
+
+# Slackの1メッセージに含められるブロックの最大数
+SLACK_BLOCKS_PER_MESSAGE = 50
+
+# Discordのembedのタイトルの最大文字数
+DISCORD_EMBED_TITLE_LIMIT = 256
+
+# Discordのembedの色（赤）
+_DISCORD_EMBED_COLOR = 0xE74C3C
+
+# Webhookの接続タイムアウトと読み込みタイムアウト（秒）
+_TIMEOUT = (3, 10)
+
+
+class _WebhookRetry(Retry):
+    """Webhook送信用のリトライ設定
+
+    urllib3は503や413もRetry-Afterヘッダーがあればリトライするため、429だけに限定します。
+    """
+
+    RETRY_AFTER_STATUS_CODES = frozenset({429})
+
+
+def _create_session():
+    """Webhook送信用のセッションを作成する関数
+
+    同じホストへの通知でTCP/TLS接続を使い回します。通知が重複しないよう、確実に受け付けられていない場合
+    （接続エラー、429）だけリトライし、5xxや読み込みタイムアウトなど届いた可能性がある場合はリトライしません。
+
+    Returns:
+        requests.Session: セッション
+    """
+    retry = _WebhookRetry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        backoff_factor=0.3,
+        status_forcelist=[429],
+        allowed_methods=["POST"],
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
+
+_SESSION = _create_session()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _post_json(webhook_url, payload):
+    """JSONのペイロードをWebhookに送信する関数
+
+    ペイロードはorjsonでbytesにシリアライズしてから送信します。
+
+    Args:
+        webhook_url (str): WebhookのURL
+        payload (dict): 送信するペイロード
+
+    Returns:
+        requests.Response: レスポンス
+    """
+    return _SESSION.post(webhook_url, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=_TIMEOUT)
+
+
+# タスクブロックの区切り（"## 1." などの見出し）
+_TASK_HEADER_RE = re.compile(rb"\n## \d+\.")
+
+# タスクブロックから各項目を抽出するパターン
+_FIELDS = {
+    "title": re.compile(r"\[(.+?)\] (.+?)(?:\n|$)"),
+    "number": re.compile(r"\*\*Issue番号\*\*: #(\d+)"),
+    "url": re.compile(r"\*\*URL\*\*: (.+?)(?:\n|$)"),
+    "state": re.compile(r"\*\*状態\*\*: (.+?)(?:\n|$)"),
+    "assignee": re.compile(r"\*\*GitHubアサイン\*\*: (.+?)(?:\n|$)"),
+    "assignee_in_body": re.compile(r"\*\*Issue本文内の記載\*\*: (.+?)(?:\n|$)"),
+    "end_date": re.compile(r"\*\*終了日\*\*: (\d{4}-\d{2}-\d{2})"),
+    "deadline": re.compile(r"\*\*Issue本文内の期限\*\*: (\d{4}-\d{2}-\d{2})"),
+    "is_overdue": re.compile(r"\*\*期限切れ\*\*: (.+?)(?:\n|$)"),
+}
+
+
+@functools.lru_cache(maxsize=1)
 def load_env_vars():
     """環境変数を読み込む関数
 
+    .envファイルの読み込みと解析はプロセス内で1度だけ行い、以降は同じ結果を返します。
+
     Returns:
         dict: 環境変数の辞書
     """
-    # 環境変数をクリア
-    if "SLACK_WEBHOOK_URL" in os.environ:
-        del os.environ["SLACK_WEBHOOK_URL"]
-    if "DISCORD_WEBHOOK_URL" in os.environ:
-        del os.environ["DISCORD_WEBHOOK_URL"]
-    if "ENABLE_SLACK_NOTIFICATION" in os.environ:
-        del os.environ["ENABLE_SLACK_NOTIFICATION"]
-    if "ENABLE_DISCORD_NOTIFICATION" in os.environ:
-        del os.environ["ENABLE_DISCORD_NOTIFICATION"]
-
-    # 環境変数を読み込む
+    # 環境変数を読み込む（.envの値を優先する）
     load_dotenv(override=True)
 
     env_vars = {}
 
     # 通知設定
-    enable_discord = os.getenv("ENABLE_DISCORD_NOTIFICATION", "false").lower() in ["true", "1", "yes", "y"]
-    enable_slack = os.getenv("ENABLE_SLACK_NOTIFICATION", "false").lower() in ["true", "1", "yes", "y"]
+    enable_discord = os.getenv("ENABLE_DISCORD_NOTIFICATION", "false").lower() in _TRUE_VALUES
+    enable_slack = os.getenv("ENABLE_SLACK_NOTIFICATION", "false").lower() in _TRUE_VALUES
 
     env_vars["ENABLE_DISCORD_NOTIFICATION"] = enable_discord
     env_vars["ENABLE_SLACK_NOTIFICATION"] = enable_slack
@@ -73,6 +161,31 @@ def load_env_vars():
     return env_vars
 
 
+def iter_task_blocks(file_path):
+    """マークダウンファイルからタスクブロックを1つずつ取り出す関数
+
+    ファイル全体を文字列として読み込まず、メモリマップしたファイル上で見出しの位置を探し、
+    ブロックごとにデコードします。見出しより前のヘッダー部分は返しません。
+
+    Args:
+        file_path (str): マークダウンファイルのパス
+
+    Yields:
+        str: タスクブロック（見出しの番号より後ろの部分）
+    """
+    with open(file_path, "rb") as f:
+        # 空のファイルはmmapできないため、タスクブロックなしとして扱う
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            bounds = [(match.start(), match.end()) for match in _TASK_HEADER_RE.finditer(mm)]
+            block_ends = [start for start, _ in bounds[1:]] + [len(mm)]
+
+            for (_, block_start), block_end in zip(bounds, block_ends):
+                yield mm[block_start:block_end].decode("utf-8").replace("\r\n", "\n")
+
+
 def extract_tasks_from_markdown(file_path):
     """マークダウンファイルからタスク情報を抽出する関数
 
@@ -86,23 +199,13 @@ def extract_tasks_from_markdown(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
 
-    # ファイルを読み込む
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # タスクブロックを抽出
-    task_blocks = re.split(r"\n## \d+\.", content)
-
-    # 最初のブロックはヘッダーなのでスキップ
-    task_blocks = task_blocks[1:]
-
     tasks = []
-    for i, block in enumerate(task_blocks, 1):
+    for block in iter_task_blocks(file_path):
         # タスク情報を抽出
         task = {}
 
         # タイトルを抽出
-        title_match = re.search(r"\[(.+?)\] (.+?)(?:\n|$)", block)
+        title_match = _FIELDS["title"].search(block)
         if title_match:
             task["category"] = title_match.group(1)
             task["title"] = title_match.group(2)
@@ -110,56 +213,56 @@ def extract_tasks_from_markdown(file_path):
             continue
 
         # Issue番号を抽出
-        issue_number_match = re.search(r"\*\*Issue番号\*\*: #(\d+)", block)
+        issue_number_match = _FIELDS["number"].search(block)
         if issue_number_match:
             task["number"] = issue_number_match.group(1)
         else:
             continue
 
         # URLを抽出
-        url_match = re.search(r"\*\*URL\*\*: (.+?)(?:\n|$)", block)
+        url_match = _FIELDS["url"].search(block)
         if url_match:
             task["url"] = url_match.group(1)
         else:
             continue
 
         # 状態を抽出
-        state_match = re.search(r"\*\*状態\*\*: (.+?)(?:\n|$)", block)
+        state_match = _FIELDS["state"].search(block)
         if state_match:
             task["state"] = state_match.group(1)
         else:
             continue
 
         # GitHubアサインを抽出
-        assignee_match = re.search(r"\*\*GitHubアサイン\*\*: (.+?)(?:\n|$)", block)
+        assignee_match = _FIELDS["assignee"].search(block)
         if assignee_match and assignee_match.group(1) != "なし":
             task["assignee"] = assignee_match.group(1)
         else:
             task["assignee"] = "なし"
 
         # Issue本文内の担当者を抽出
-        assignee_in_body_match = re.search(r"\*\*Issue本文内の記載\*\*: (.+?)(?:\n|$)", block)
+        assignee_in_body_match = _FIELDS["assignee_in_body"].search(block)
         if assignee_in_body_match:
             task["assignee_in_body"] = assignee_in_body_match.group(1)
         else:
             task["assignee_in_body"] = ""
 
         # 終了日を抽出
-        end_date_match = re.search(r"\*\*終了日\*\*: (\d{4}-\d{2}-\d{2})", block)
+        end_date_match = _FIELDS["end_date"].search(block)
         if end_date_match:
             task["end_date"] = end_date_match.group(1)
         else:
             task["end_date"] = ""
 
         # Issue本文内の期限を抽出
-        deadline_match = re.search(r"\*\*Issue本文内の期限\*\*: (\d{4}-\d{2}-\d{2})", block)
+        deadline_match = _FIELDS["deadline"].search(block)
         if deadline_match:
             task["deadline"] = deadline_match.group(1)
         else:
             task["deadline"] = ""
 
         # 期限切れ状態を抽出
-        overdue_match = re.search(r"\*\*期限切れ\*\*: (.+?)(?:\n|$)", block)
+        overdue_match = _FIELDS["is_overdue"].search(block)
         if overdue_match:
             task["is_overdue"] = overdue_match.group(1)
         else:
@@ -216,6 +319,34 @@ def create_notification_message(task):
     return content
 
 
+def create_slack_message(task):
+    """Slack向けの通知メッセージを作成する関数
+
+    Args:
+        task (dict): タスク情報
+
+    Returns:
+        str: 通知メッセージ
+    """
+    # 期限を取得
+    deadline = task.get("deadline", "") or task.get("end_date", "")
+
+    return f"期限切れタスク: [{task['category']}] {task['title']} (#{task['number']}) の期限（{deadline}）が過ぎています"
+
+
+def split_into_chunks(items, size):
+    """リストを指定した件数ごとに分割する関数
+
+    Args:
+        items (list): 分割するリスト
+        size (int): 1つのチャンクの最大件数
+
+    Returns:
+        list: 分割したリストのリスト
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
 def send_discord_notification(webhook_url, task):
     """Discordに通知を送信する関数
 
@@ -231,10 +362,9 @@ def send_discord_notification(webhook_url, task):
 
     # Discordに通知
     payload = {"content": content}
-    headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(webhook_url, data=json.dumps(payload), headers=headers)
+        response = _post_json(webhook_url, payload)
         response.raise_for_status()
         return True
     except requests.exceptions.RequestException as e:
@@ -252,22 +382,18 @@ def send_slack_notification(webhook_url, task):
     Returns:
         bool: 送信成功の場合はTrue、失敗の場合はFalse
     """
-    # 期限を取得
-    deadline = task.get("deadline", "") or task.get("end_date", "")
-
     # 通知内容を作成
-    message = f"期限切れタスク: [{task['category']}] {task['title']} (#{task['number']}) の期限（{deadline}）が過ぎています"
+    message = create_slack_message(task)
 
     print(f"Slackへの通知内容: {message}")
     print(f"Slack Webhook URL: {webhook_url[:30]}...")
 
     # requestsライブラリを使用してメッセージを送信
     payload = {"text": message}
-    headers = {"Content-type": "application/json"}
 
     try:
         print("Slackへメッセージを送信します...")
-        response = requests.post(webhook_url, data=json.dumps(payload), headers=headers)
+        response = _post_json(webhook_url, payload)
 
         print(f"ステータスコード: {response.status_code}")
         print(f"レスポンス: {response.text}")
@@ -283,6 +409,95 @@ def send_slack_notification(webhook_url, task):
         return False
 
 
+def _truncate(text, limit):
+    """文字列を最大文字数に収める関数
+
+    Args:
+        text (str): 文字列
+        limit (int): 最大文字数
+
+    Returns:
+        str: 最大文字数を超える場合は末尾を「…」に置き換えた文字列
+    """
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1] + "…"
+
+
+def send_discord_notifications(webhook_url, tasks):
+    """複数のタスクを1つのメッセージにまとめてDiscordに通知する関数
+
+    タスクごとにembedを作成し、1回のリクエストで送信します。一括送信の内容が拒否された場合
+    （400）だけタスクごとに個別に送信し、Webhookそのものが使えない場合（401、404など）は送信を諦めます。
+
+    Args:
+        webhook_url (str): Discord WebhookのURL
+        tasks (list): タスク情報のリスト（最大DISCORD_EMBEDS_PER_MESSAGE件）
+
+    Returns:
+        int: 通知に成功したタスクの件数
+    """
+    embeds = [
+        {
+            "title": _truncate(f"[{task['category']}] {task['title']} (#{task['number']})", DISCORD_EMBED_TITLE_LIMIT),
+            "url": task["url"],
+            "description": create_notification_message(task),
+            "color": _DISCORD_EMBED_COLOR,
+        }
+        for task in tasks
+    ]
+    payload = {"embeds": embeds}
+
+    try:
+        response = _post_json(webhook_url, payload)
+        response.raise_for_status()
+        return len(tasks)
+    except requests.exceptions.HTTPError as e:
+        if e.response.status_code == 400:
+            print(f"Discordへの一括通知が拒否されたため、個別に送信します: {e}")
+            return sum(send_discord_notification(webhook_url, task) for task in tasks)
+        print(f"Discordへの通知送信エラー: {e}")
+        return 0
+    except requests.exceptions.RequestException as e:
+        print(f"Discordへの通知送信エラー: {e}")
+        return 0
+
+
+def send_slack_notifications(webhook_url, tasks):
+    """複数のタスクを1つのメッセージにまとめてSlackに通知する関数
+
+    タスクごとにsectionブロックを作成し、1回のリクエストで送信します。一括送信の内容が
+    拒否された場合（400）だけタスクごとに個別に送信し、Webhookそのものが使えない場合（403、404など）は送信を諦めます。
+
+    Args:
+        webhook_url (str): Slack WebhookのURL
+        tasks (list): タスク情報のリスト（最大SLACK_BLOCKS_PER_MESSAGE件）
+
+    Returns:
+        int: 通知に成功したタスクの件数
+    """
+    messages = [create_slack_message(task) for task in tasks]
+    blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": message}} for message in messages]
+    payload = {"text": "\n".join(messages), "blocks": blocks}
+
+    try:
+        print(f"Slackへ{len(tasks)}件のタスクをまとめて送信します...")
+        response = _post_json(webhook_url, payload)
+
+        if response.status_code == 200 and response.text == "ok":
+            print("Slackへの通知送信成功")
+            return len(tasks)
+        elif response.status_code == 400:
+            print(f"Slackへの一括通知が拒否されたため、個別に送信します: ステータスコード={response.status_code}")
+            return sum(send_slack_notification(webhook_url, task) for task in tasks)
+        else:
+            print(f"Slackへの通知送信エラー: ステータスコード={response.status_code}")
+            return 0
+    except Exception as e:
+        print(f"Slackへの通知送信エラー: {e}")
+        return 0
+
+
 def main():
     """メイン関数"""
     try:
@@ -305,30 +520,36 @@ def main():
             print("期限切れタスクはありません。")
             return 0
 
-        # 期限切れタスクを通知
-        discord_success = 0
-        slack_success = 0
+        discord_enabled = env_vars["ENABLE_DISCORD_NOTIFICATION"] and "DISCORD_WEBHOOK_URL" in env_vars
+        slack_enabled = env_vars["ENABLE_SLACK_NOTIFICATION"] and "SLACK_WEBHOOK_URL" in env_vars
 
         for task in overdue_tasks:
             print(f"期限切れタスク: [{task['category']}] {task['title']} (#{task['number']})")
 
-            # Discordに通知
-            if env_vars["ENABLE_DISCORD_NOTIFICATION"] and "DISCORD_WEBHOOK_URL" in env_vars:
-                if send_discord_notification(env_vars["DISCORD_WEBHOOK_URL"], task):
-                    discord_success += 1
+        # 通知先ごとに、1メッセージに収まる件数ずつタスクをまとめた送信ジョブを作成
+        jobs = []
+        if discord_enabled:
+            for chunk in split_into_chunks(overdue_tasks, DISCORD_EMBEDS_PER_MESSAGE):
+                jobs.append((send_discord_notifications, env_vars["DISCORD_WEBHOOK_URL"], chunk))
+
+        if slack_enabled:
+            for chunk in split_into_chunks(overdue_tasks, SLACK_BLOCKS_PER_MESSAGE):
+                jobs.append((send_slack_notifications, env_vars["SLACK_WEBHOOK_URL"], chunk))
+
+        # 期限切れタスクを並列に通知（Webhookの待ち時間を重ねる）
+        with ThreadPoolExecutor(max_workers=NOTIFICATION_WORKERS) as executor:
+            futures = [(send, executor.submit(send, url, chunk)) for send, url, chunk in jobs]
 
-            # Slackに通知
-            if env_vars["ENABLE_SLACK_NOTIFICATION"] and "SLACK_WEBHOOK_URL" in env_vars:
-                if send_slack_notification(env_vars["SLACK_WEBHOOK_URL"], task):
-                    slack_success += 1
+        discord_success = sum(future.result() for send, future in futures if send is send_discord_notifications)
+        slack_success = sum(future.result() for send, future in futures if send is send_slack_notifications)
 
         # 通知結果を表示
-        if env_vars["ENABLE_DISCORD_NOTIFICATION"] and "DISCORD_WEBHOOK_URL" in env_vars:
+        if discord_enabled:
             print(f"Discord: {discord_success}/{len(overdue_tasks)}件の通知を送信しました。")
         else:
             print("Discord通知は無効です。")
 
-        if env_vars["ENABLE_SLACK_NOTIFICATION"] and "SLACK_WEBHOOK_URL" in env_vars:
+        if slack_enabled:
             print(f"Slack: {slack_success}/{len(overdue_tasks)}件の通知を送信しました。")
         else:
             print("Slack通知は無効です。")
@@ -9,16 +9,190 @@ docs/tasks.mdファイルにマークダウン形式で書き込みます。
 """
 
 import os
-import json
 import re
+import shlex
+import hashlib
+import functools
 import datetime
 import subprocess
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# GitHub GraphQL APIのエンドポイント
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# プロジェクトのアイテムを1ページ（100件）取得するGraphQLクエリ
+# ユーザー名・プロジェクト番号・カーソルは変数で渡すため、実行ごとにクエリの文字列は変わらない。
+# 開始日・終了日は全フィールドの値を並べて取得せず、フィールド名を指定して日付だけを取得する
+PROJECT_ITEMS_QUERY = """
+query($login: String!, $number: Int!, $cursor: String) {
+  user(login: $login) {
+    projectV2(number: $number) {
+      items(first: 100, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          content {
+            ... on Issue {
+              title
+              number
+              state
+              body
+              url
+              updatedAt
+              labels(first: 10) {
+                nodes {
+                  name
+                }
+              }
+              assignees(first: 5) {
+                nodes {
+                  login
+                  name
+                }
+              }
+              repository {
+                nameWithOwner
+              }
+            }
+          }
+          startDate: fieldValueByName(name: "開始日") {
+            ...DateValue
+          }
+          startDateEn: fieldValueByName(name: "Start date") {
+            ...DateValue
+          }
+          endDate: fieldValueByName(name: "終了日") {
+            ...DateValue
+          }
+          endDateEn: fieldValueByName(name: "End date") {
+            ...DateValue
+          }
+        }
+      }
+    }
+  }
+}
+
+fragment DateValue on ProjectV2ItemFieldDateValue {
+  date
+}
+"""
+
+# GraphQL APIの接続タイムアウトと読み込みタイムアウト（秒）
+_TIMEOUT = (5, 30)
+
+# Issue本文の解析結果のキャッシュ
+CACHE_DIR = ".cache"
+CACHE_FILE = os.path.join(CACHE_DIR, "tasks_cache.json")
+
+# Issue本文から担当者を抽出するパターン（優先度の高い順）
+# 書き方ごとに先頭が固定の文字列のパターンにしておくと、reはその文字列を高速に探してから照合できる。
+# 1つの選択（|）にまとめるとこの最適化が効かなくなり、かえって遅くなる。
+# 見出しの直後は改行を含まない空白（[^\S\n]*）だけを読むことで、空行が続く本文でもバックトラックが増えない
+_ASSIGNEE_PATTERNS = (
+    re.compile(r"## 担当者[^\S\n]*\n\s*(.+?)(?:\n|$)"),  # ## 担当者 の後の行
+    re.compile(r"担当者[:：]\s*(.+?)(?:\n|$)"),  # 担当者: の後
+    re.compile(r"担当[:：]\s*(.+?)(?:\n|$)"),  # 担当: の後
+)
+
+# Issue本文から期限を抽出するパターン（優先度の高い順。大文字小文字を区別しないのは英語の書き方だけ）
+_DEADLINE_PATTERNS = (
+    re.compile(r"## 期限[^\S\n]*\n\s*(.+?)(?:\n|$)"),  # ## 期限 の後の行
+    re.compile(r"期限[:：]\s*(.+?)(?:\n|$)"),  # 期限: の後
+    re.compile(r"締切[:：]\s*(.+?)(?:\n|$)"),  # 締切: の後
+    re.compile(r"deadline[:：]\s*(.+?)(?:\n|$)", re.IGNORECASE),  # deadline: の後
+)
+
+# 開始日・終了日を取得したクエリ内の別名（優先度の高い順）
+_START_DATE_ALIASES = ("startDate", "startDateEn")
+_END_DATE_ALIASES = ("endDate", "endDateEn")
+
+# 期限切れ判定の結果
+_OVERDUE_END_PAST = "はい（終了日が過去の日付）"
+_OVERDUE_END_FUTURE = "いいえ（終了日は未来の日付）"
+_OVERDUE_BODY_PAST = "はい（本文内の期限が過去の日付）"
+_OVERDUE_BODY_FUTURE = "いいえ（本文内の期限は未来の日付）"
+_OVERDUE_CLOSED = "いいえ（タスクは完了済み）"
+_OVERDUE_UNKNOWN = "不明（期限が設定されていません）"
+
+# 期限として参照する項目と、(期限を過ぎていない場合, 過ぎている場合) の判定結果（優先度の高い順）
+_OVERDUE_RULES = (
+    ("end_date", (_OVERDUE_END_FUTURE, _OVERDUE_END_PAST)),
+    ("deadline_in_body", (_OVERDUE_BODY_FUTURE, _OVERDUE_BODY_PAST)),
+)
+
+# 日付（YYYY-MM-DD、YYYY/MM/DD形式）
+_DATE_RE = re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})")
+
+# キャッシュのバージョン（担当者・期限・日付のパターンから求めるため、パターンを変えると古いキャッシュは使われなくなる）
+CACHE_VERSION = hashlib.sha1(
+    "\n".join(f"{p.flags}:{p.pattern}" for p in (*_ASSIGNEE_PATTERNS, *_DEADLINE_PATTERNS, _DATE_RE)).encode("utf-8")
+).hexdigest()[:16]
+
+# タイトル先頭のカテゴリ
+_CATEGORY_RE = re.compile(r"^\[(.+?)\]")
+
+# タイトル先頭のカテゴリ部分（後続の空白を含む）
+_TITLE_STRIP_RE = re.compile(r"^\[.+?\]\s*")
+
+# 詳細な作業内容セクション
+_DETAIL_HEADING = "## 詳細な作業内容"
+_DETAIL_RE = re.compile(r"## 詳細な作業内容\s*\n(.*?)(?:\n##|\Z)", re.DOTALL)
+
+
+@dataclass(slots=True)
+class TaskInfo:
+    """タスク情報
+
+    タスクごとに辞書を作らず、属性を固定したオブジェクトとして保持します。
+
+    Attributes:
+        title (str): Issueのタイトル
+        number (int): Issue番号
+        state (str): Issueの状態（OPEN/CLOSED）
+        body (str): Issue本文
+        url (str): IssueのURL
+        updated_at (str): Issueの更新日時
+        repository (str): "オーナー/リポジトリ名"形式のリポジトリ
+        labels (list): ラベル名のリスト
+        assignees (list): アサインされたユーザー（login、name）の辞書のリスト
+        start_date (str): プロジェクトの開始日
+        end_date (str): プロジェクトの終了日
+        assignee_in_body (str): Issue本文内に記載された担当者
+        deadline_in_body (str): Issue本文内に記載された期限（YYYY-MM-DD形式）
+        is_overdue (str): 期限切れの状態
+    """
 
+    title: str = ""
+    number: int = 0
+    state: str = ""
+    body: str = ""
+    url: str = ""
+    updated_at: str = ""
+    repository: str = ""
+    labels: list = field(default_factory=list)
+    assignees: list = field(default_factory=list)
+    start_date: str = ""
+    end_date: str = ""
+    assignee_in_body: str = ""
+    deadline_in_body: str = ""
+    is_overdue: str = ""
+
+
+@functools.lru_cache(maxsize=1)
 def load_env_vars():
     """環境変数を読み込む関数
 
+    .envファイルの読み込みと解析はプロセス内で1度だけ行い、以降は同じ結果を返します。
+
     Returns:
         dict: 環境変数の辞書
     """
@@ -39,15 +213,17 @@ def load_env_vars():
 def run_command(command):
     """コマンドを実行する関数
 
+    シェルを介さず、引数のリストをそのままプロセスに渡して実行します。
+
     Args:
-        command (str): 実行するコマンド
+        command (list): 実行するコマンドと引数のリスト
 
     Returns:
         str: コマンドの出力
     """
-    print(f"コマンドを実行します: {command}")
+    print(f"コマンドを実行します: {shlex.join(command)}")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         return result.stdout
     except subprocess.CalledProcessError as e:
         print(f"コマンド実行エラー: {e}")
@@ -55,151 +231,246 @@ def run_command(command):
         raise
 
 
-def fetch_project_tasks(env_vars):
-    """GitHubプロジェクトのタスク情報を取得する関数
+def get_github_token():
+    """GitHub APIのアクセストークンを取得する関数
 
-    Args:
-        env_vars (dict): 環境変数の辞書
+    環境変数 GITHUB_TOKEN を優先し、設定されていない場合はGitHub CLIのトークン（gh auth token）を使います。
 
     Returns:
-        list: タスク情報のリスト
+        str: アクセストークン
     """
-    # GraphQLクエリを作成
-    query = f"""
-    query {{
-      user(login: "{env_vars["REPO_OWNER"]}") {{
-        projectV2(number: {env_vars["GITHUB_PROJECT_NUMBER"]}) {{
-          items(first: 100) {{
-            nodes {{
-              content {{
-                ... on Issue {{
-                  title
-                  number
-                  state
-                  body
-                  url
-                  labels(first: 10) {{
-                    nodes {{
-                      name
-                    }}
-                  }}
-                  assignees(first: 5) {{
-                    nodes {{
-                      login
-                      name
-                    }}
-                  }}
-                  repository {{
-                    name
-                    owner {{
-                      login
-                    }}
-                  }}
-                }}
-              }}
-              fieldValues(first: 20) {{
-                nodes {{
-                  ... on ProjectV2ItemFieldDateValue {{
-                    field {{
-                      ... on ProjectV2FieldCommon {{
-                        name
-                      }}
-                    }}
-                    date
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-      }}
-    }}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        return token
+    return run_command(["gh", "auth", "token"]).strip()
+
+
+def _create_session(token):
+    """GitHub GraphQL API用のセッションを作成する関数
+
+    ページごとのリクエストでTCP/TLS接続を使い回し、一時的なエラー（5xx）はリトライします。
+
+    Args:
+        token (str): GitHub APIのアクセストークン
+
+    Returns:
+        requests.Session: セッション
     """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["POST"],
+    )
+    session = requests.Session()
+    session.headers["Authorization"] = f"bearer {token}"
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+def _fetch_page(session, variables):
+    """GitHubプロジェクトのタスク情報を1ページ分取得する関数
+
+    Args:
+        session (requests.Session): GraphQL API用のセッション
+        variables (dict): GraphQLクエリの変数
 
-    # GraphQLクエリを実行
-    command = f"gh api graphql -f query='{query}'"
-    output = run_command(command)
+    Returns:
+        tuple: 1ページ分のタスク情報のリストと、ページ情報（pageInfo）の辞書
+    """
+    print(f"GraphQL APIにリクエストします: {GRAPHQL_URL}")
+    response = session.post(GRAPHQL_URL, json={"query": PROJECT_ITEMS_QUERY, "variables": variables}, timeout=_TIMEOUT)
+    response.raise_for_status()
+    # レスポンスのbytesを文字列にデコードせず、そのままorjsonで解析する
+    data = orjson.loads(response.content)
 
-    # JSONをパース
-    data = json.loads(output)
+    if data.get("errors"):
+        raise Exception(f"GraphQL APIエラー: {data['errors']}")
 
     # タスク情報を取得
     try:
-        project_items = data["data"]["user"]["projectV2"]["items"]["nodes"]
-        return project_items
+        items = data["data"]["user"]["projectV2"]["items"]
+        return items["nodes"], items["pageInfo"]
     except (KeyError, TypeError) as e:
         raise Exception(f"レスポンスの解析エラー: {e}")
 
 
-def extract_task_info(task_item):
-    """タスク情報を抽出する関数
+def fetch_project_tasks(env_vars):
+    """GitHubプロジェクトのタスク情報をページごとに取得する関数
+
+    全ページをまとめて保持しないよう、1ページ取得するごとにそのアイテムを返します。
+    呼び出し元がページを処理している間に、次のページをバックグラウンドのスレッドで取得しておきます。
+
+    Args:
+        env_vars (dict): 環境変数の辞書
+
+    Yields:
+        list: 1ページ分（最大100件）のタスク情報のリスト
+    """
+    variables = {
+        "login": env_vars["REPO_OWNER"],
+        "number": int(env_vars["GITHUB_PROJECT_NUMBER"]),
+        "cursor": None,
+    }
+
+    # 100件ずつ、最後のページまでGraphQLクエリを実行（接続は全ページで使い回す）
+    with _create_session(get_github_token()) as session, ThreadPoolExecutor(max_workers=1) as executor:
+        nodes, page_info = _fetch_page(session, variables)
+        while True:
+            # 次のページがあれば、このページを返す前に取得を始めておく
+            next_page = None
+            if page_info["hasNextPage"]:
+                next_page = executor.submit(_fetch_page, session, {**variables, "cursor": page_info["endCursor"]})
+
+            yield nodes
+
+            if next_page is None:
+                return
+            nodes, page_info = next_page.result()
+
+
+def load_cache():
+    """Issue本文の解析結果のキャッシュを読み込む関数
+
+    抽出処理のバージョンが異なるキャッシュは、古い抽出結果を使わないよう読み捨てます。
+
+    Returns:
+        dict: "リポジトリ#Issue番号"をキーとするキャッシュ情報の辞書（読み込めない場合は空の辞書）
+    """
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("tasks", {})
+
+
+def save_cache(tasks):
+    """Issue本文の解析結果をキャッシュに書き込む関数
+
+    今回取得したタスクの分だけを書き込むため、プロジェクトから外れたIssueの情報は残りません。
+
+    Args:
+        tasks (list): タスク情報のリスト
+    """
+    entries = {
+        _cache_key(task_info): {
+            "updated_at": task_info.updated_at,
+            "assignee_in_body": task_info.assignee_in_body,
+            "deadline_in_body": task_info.deadline_in_body,
+        }
+        for task_info in tasks
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps({"version": CACHE_VERSION, "tasks": entries}))
+
+
+def _cache_key(task_info):
+    """タスク情報に対応するキャッシュのキーを返す関数
+
+    Args:
+        task_info (TaskInfo): タスク情報
+
+    Returns:
+        str: "リポジトリ#Issue番号"形式のキー
+    """
+    return f"{task_info.repository}#{task_info.number}"
+
+
+def _field_date(task_item, aliases):
+    """プロジェクトの日付フィールドの値を取得する関数
 
     Args:
         task_item (dict): タスク情報の辞書
+        aliases (tuple): クエリ内での日付フィールドの別名（優先度の高い順）
 
     Returns:
-        dict: 整形されたタスク情報
+        str: 日付（YYYY-MM-DD形式。設定されていない場合は空文字列）
     """
-    task_info = {}
+    for alias in aliases:
+        # フィールドがない場合はNone、日付以外のフィールドの場合は空の辞書になる
+        field_value = task_item.get(alias)
+        if field_value and field_value.get("date"):
+            return field_value["date"]
 
-    # コンテンツ情報がない場合はスキップ
-    if not task_item.get("content"):
-        return None
+    return ""
 
-    content = task_item["content"]
 
-    # 基本情報
-    task_info["title"] = content.get("title", "")
-    task_info["number"] = content.get("number", "")
-    task_info["state"] = content.get("state", "")
-    task_info["body"] = content.get("body", "")
-    task_info["url"] = content.get("url", "")
-
-    # リポジトリ情報
-    if content.get("repository"):
-        repo = content["repository"]
-        task_info["repository"] = f"{repo['owner']['login']}/{repo['name']}"
-    else:
-        task_info["repository"] = ""
+def extract_task_info(task_item, today, cache=None):
+    """タスク情報を抽出する関数
 
-    # ラベル情報
-    if content.get("labels") and content["labels"].get("nodes"):
-        task_info["labels"] = [label["name"] for label in content["labels"]["nodes"]]
-    else:
-        task_info["labels"] = []
+    Args:
+        task_item (dict): タスク情報の辞書
+        today (datetime.date): 期限切れ判定の基準日
+        cache (dict, optional): Issue本文の解析結果のキャッシュ。Issueの更新日時が一致すれば本文を解析し直さない
+
+    Returns:
+        TaskInfo: 整形されたタスク情報（Issue以外のアイテムの場合はNone）
+    """
+    # コンテンツ情報がない場合（Issue以外のアイテムは空の辞書になる）はスキップ
+    content = task_item.get("content")
+    if not content:
+        return None
 
-    # アサイン情報
-    if content.get("assignees") and content["assignees"].get("nodes"):
-        task_info["assignees"] = [
-            {"login": assignee["login"], "name": assignee.get("name", "")} for assignee in content["assignees"]["nodes"]
-        ]
+    # ラベル情報（スキーマ上nullになりうるのはラベルの接続だけで、空の場合もnodesは空のリストになる）
+    labels = content["labels"]
+    labels = [label["name"] for label in labels["nodes"]] if labels else []
+
+    # 基本情報（... on Issue に一致した場合、これらのフィールドは必ず含まれる）とフィールド値
+    task_info = TaskInfo(
+        title=content["title"],
+        number=content["number"],
+        state=content["state"],
+        body=content["body"],
+        url=content["url"],
+        updated_at=content["updatedAt"],
+        repository=content["repository"]["nameWithOwner"],
+        labels=labels,
+        assignees=[{"login": assignee["login"], "name": assignee["name"]} for assignee in content["assignees"]["nodes"]],
+        start_date=_field_date(task_item, _START_DATE_ALIASES),
+        end_date=_field_date(task_item, _END_DATE_ALIASES),
+    )
+
+    # 本文から担当者と期限を抽出（Issueが更新されていなければキャッシュした結果を使う）
+    cached = cache.get(_cache_key(task_info)) if cache else None
+    if cached and cached.get("updated_at") == task_info.updated_at:
+        task_info.assignee_in_body = cached["assignee_in_body"]
+        task_info.deadline_in_body = cached["deadline_in_body"]
     else:
-        task_info["assignees"] = []
+        task_info.assignee_in_body = extract_assignee_from_body(task_info.body)
+        task_info.deadline_in_body = extract_deadline_from_body(task_info.body)
 
-    # フィールド値
-    task_info["start_date"] = ""
-    task_info["end_date"] = ""
+    # 期限切れ判定（基準日やプロジェクトの終了日に依存するため、キャッシュせず毎回判定する）
+    task_info.is_overdue = check_if_overdue(task_info, today)
 
-    if task_item.get("fieldValues") and task_item["fieldValues"].get("nodes"):
-        for field_value in task_item["fieldValues"]["nodes"]:
-            if not field_value.get("field"):
-                continue
+    return task_info
 
-            field_name = field_value["field"]["name"]
 
-            if field_name in ["開始日", "Start date"] and "date" in field_value:
-                task_info["start_date"] = field_value["date"]
-            elif field_name in ["終了日", "End date"] and "date" in field_value:
-                task_info["end_date"] = field_value["date"]
+def extract_tasks(pages, today, cache=None):
+    """取得したページごとにタスク情報を抽出する関数
 
-    # 本文から担当者と期限を抽出
-    task_info["assignee_in_body"] = extract_assignee_from_body(task_info["body"])
-    task_info["deadline_in_body"] = extract_deadline_from_body(task_info["body"])
+    Args:
+        pages (iterable): 1ページ分のタスク情報のリストを返すイテラブル
+        today (datetime.date): 期限切れ判定の基準日
+        cache (dict, optional): Issue本文の解析結果のキャッシュ
 
-    # 期限切れ判定
-    task_info["is_overdue"] = check_if_overdue(task_info)
+    Returns:
+        tuple: 抽出したタスク情報のリストと、取得したアイテムの件数
+    """
+    tasks = []
+    item_count = 0
+    for project_items in pages:
+        item_count += len(project_items)
+        for item in project_items:
+            task_info = extract_task_info(item, today, cache)
+            if task_info:
+                tasks.append(task_info)
 
-    return task_info
+    return tasks, item_count
 
 
 def extract_assignee_from_body(body):
@@ -211,15 +482,13 @@ def extract_assignee_from_body(body):
     Returns:
         str: 担当者名
     """
-    # 担当者を抽出するパターン
-    patterns = [
-        r"## 担当者\s*\n\s*(.+?)(?:\n|$)",  # ## 担当者 の後の行
-        r"担当者[:：]\s*(.+?)(?:\n|$)",  # 担当者: の後
-        r"担当[:：]\s*(.+?)(?:\n|$)",  # 担当: の後
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, body)
+    # どの書き方にも含まれる文字列がなければ、正規表現での走査を省く
+    if "担当" not in body:
+        return ""
+
+    # 優先度の高い書き方から順に探し、見つかった時点で確定する
+    for pattern in _ASSIGNEE_PATTERNS:
+        match = pattern.search(body)
         if match:
             return match.group(1).strip()
 
@@ -235,21 +504,16 @@ def extract_deadline_from_body(body):
     Returns:
         str: 期限（YYYY-MM-DD形式）
     """
-    # 期限を抽出するパターン
-    patterns = [
-        r"## 期限\s*\n\s*(.+?)(?:\n|$)",  # ## 期限 の後の行
-        r"期限[:：]\s*(.+?)(?:\n|$)",  # 期限: の後
-        r"締切[:：]\s*(.+?)(?:\n|$)",  # 締切: の後
-        r"deadline[:：]\s*(.+?)(?:\n|$)",  # deadline: の後
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, body, re.IGNORECASE)
-        if match:
-            date_str = match.group(1).strip()
+    # どの書き方のキーワードも含まれなければ、正規表現での走査を省く（小文字化は必要な場合だけ行う）
+    if "期限" not in body and "締切" not in body and "deadline" not in body.lower():
+        return ""
 
+    # 優先度の高い書き方から順に、日付として読めるものを採用する
+    for pattern in _DEADLINE_PATTERNS:
+        match = pattern.search(body)
+        if match:
             # YYYY-MM-DD形式かチェック
-            date_match = re.search(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", date_str)
+            date_match = _DATE_RE.search(match.group(1).strip())
             if date_match:
                 year, month, day = date_match.groups()
                 return f"{year}-{int(month):02d}-{int(day):02d}"
@@ -257,178 +521,204 @@ def extract_deadline_from_body(body):
     return ""
 
 
-def check_if_overdue(task_info):
-    """タスクが期限切れかどうかを判定する関数
+@functools.lru_cache(maxsize=256)
+def _parse_iso_date(value):
+    """YYYY-MM-DD形式の日付文字列を解析する関数
+
+    同じ期限の日付は複数のタスクで繰り返し現れるため、解析結果をキャッシュします。
 
     Args:
-        task_info (dict): タスク情報
+        value (str): 日付文字列
 
     Returns:
-        str: 期限切れの状態（"はい"または"いいえ"と理由）
+        datetime.date: 日付（解析できない場合はNone）
     """
-    today = datetime.date.today()
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
 
-    # 終了日がある場合
-    if task_info["end_date"]:
-        try:
-            end_date = datetime.date.fromisoformat(task_info["end_date"])
-            if end_date < today:
-                return "はい（終了日が過去の日付）"
-            else:
-                return "いいえ（終了日は未来の日付）"
-        except ValueError:
-            pass
 
-    # 本文内の期限がある場合
-    if task_info["deadline_in_body"]:
-        try:
-            deadline = datetime.date.fromisoformat(task_info["deadline_in_body"])
-            if deadline < today:
-                return "はい（本文内の期限が過去の日付）"
-            else:
-                return "いいえ（本文内の期限は未来の日付）"
-        except ValueError:
-            pass
+def check_if_overdue(task_info, today):
+    """タスクが期限切れかどうかを判定する関数
+
+    Args:
+        task_info (TaskInfo): タスク情報
+        today (datetime.date): 判定の基準日（タスクごとに取得せず、呼び出し元で1度だけ取得する）
+
+    Returns:
+        str: 期限切れの状態（"はい"または"いいえ"と理由）
+    """
+    # 終了日、本文内の期限の順に、日付として読めるものがあれば判定する
+    for key, results in _OVERDUE_RULES:
+        value = getattr(task_info, key)
+        if value:
+            deadline = _parse_iso_date(value)
+            if deadline is not None:
+                return results[deadline < today]
 
     # どちらもない場合
-    if task_info["state"] == "CLOSED":
-        return "いいえ（タスクは完了済み）"
+    if task_info.state == "CLOSED":
+        return _OVERDUE_CLOSED
+
+    return _OVERDUE_UNKNOWN
 
-    return "不明（期限が設定されていません）"
 
+def format_task_to_markdown(task_info, index, out_file):
+    """タスク情報をマークダウン形式に整形して書き込む関数
 
-def format_task_to_markdown(task_info, index):
-    """タスク情報をマークダウン形式に整形する関数
+    タスクごとの文字列を作らず、書き込み先に直接書き込みます。
 
     Args:
-        task_info (dict): タスク情報
+        task_info (TaskInfo): タスク情報
         index (int): タスクのインデックス
-
-    Returns:
-        str: マークダウン形式のタスク情報
+        out_file (io.TextIOBase): 書き込み先のファイルオブジェクト
     """
     # タイトルからカテゴリを抽出
-    category_match = re.match(r"\[(.+?)\]", task_info["title"])
+    category_match = _CATEGORY_RE.match(task_info.title)
     category = category_match.group(1) if category_match else "その他"
 
     # タイトルからカテゴリ部分を削除
-    title = re.sub(r"^\[.+?\]\s*", "", task_info["title"])
+    title = _TITLE_STRIP_RE.sub("", task_info.title)
 
     # マークダウン形式に整形
-    markdown = f"## {index}. [{category}] {title}\n\n"
+    write = out_file.write
+    write(f"## {index}. [{category}] {title}\n\n")
 
     # 基本情報
-    markdown += "### 基本情報\n"
-    markdown += f"- **Issue番号**: #{task_info['number']}\n"
-    markdown += f"- **リポジトリ**: {task_info['repository']}\n"
-    markdown += f"- **URL**: {task_info['url']}\n"
-    markdown += f"- **状態**: {task_info['state']}\n"
+    write("### 基本情報\n")
+    write(f"- **Issue番号**: #{task_info.number}\n")
+    write(f"- **リポジトリ**: {task_info.repository}\n")
+    write(f"- **URL**: {task_info.url}\n")
+    write(f"- **状態**: {task_info.state}\n")
 
     # ラベル情報
-    if task_info["labels"]:
-        markdown += f"- **ラベル**: {', '.join(task_info['labels'])}\n"
+    if task_info.labels:
+        write(f"- **ラベル**: {', '.join(task_info.labels)}\n")
 
-    markdown += "\n"
+    write("\n")
 
     # 担当者情報
-    markdown += "### 担当者情報\n"
+    write("### 担当者情報\n")
 
-    if task_info["assignees"]:
+    if task_info.assignees:
         assignee_info = []
-        for assignee in task_info["assignees"]:
+        for assignee in task_info.assignees:
             if assignee.get("name"):
                 assignee_info.append(f"{assignee['login']} ({assignee['name']})")
             else:
                 assignee_info.append(assignee["login"])
 
-        markdown += f"- **GitHubアサイン**: {', '.join(assignee_info)}\n"
+        write(f"- **GitHubアサイン**: {', '.join(assignee_info)}\n")
     else:
-        markdown += "- **GitHubアサイン**: なし\n"
+        write("- **GitHubアサイン**: なし\n")
 
-    if task_info["assignee_in_body"]:
-        markdown += f"- **Issue本文内の記載**: {task_info['assignee_in_body']}\n"
+    if task_info.assignee_in_body:
+        write(f"- **Issue本文内の記載**: {task_info.assignee_in_body}\n")
 
-    markdown += "\n"
+    write("\n")
 
     # 詳細内容
-    markdown += "### 詳細内容\n"
+    write("### 詳細内容\n")
 
     # 詳細な作業内容を抽出
-    if "## 詳細な作業内容" in task_info["body"]:
-        # 詳細な作業内容セクションを抽出
-        detail_match = re.search(r"## 詳細な作業内容\s*\n(.*?)(?:\n##|\Z)", task_info["body"], re.DOTALL)
+    body = task_info.body
+    detail_start = body.find(_DETAIL_HEADING)
+    if detail_start != -1:
+        # 詳細な作業内容セクションを抽出（見出しより前は走査し直さない）
+        detail_match = _DETAIL_RE.search(body, detail_start)
         if detail_match:
             detail = detail_match.group(1).strip()
-            markdown += f"- **詳細な作業内容**: {detail}\n"
+            write(f"- **詳細な作業内容**: {detail}\n")
         else:
-            markdown += "- **詳細**: 詳細情報なし\n"
+            write("- **詳細**: 詳細情報なし\n")
     else:
         # 本文から意味のある最初の行を抽出
-        lines = [line.strip() for line in task_info["body"].split("\n") if line.strip() and not line.strip().startswith("#")]
-        if lines:
-            markdown += f"- **詳細**: {lines[0]}\n"
+        first_line = extract_first_line(body)
+        if first_line:
+            write(f"- **詳細**: {first_line}\n")
         else:
-            markdown += "- **詳細**: 詳細情報なし\n"
+            write("- **詳細**: 詳細情報なし\n")
 
-    if task_info["deadline_in_body"]:
-        markdown += f"- **Issue本文内の期限**: {task_info['deadline_in_body']}\n"
+    if task_info.deadline_in_body:
+        write(f"- **Issue本文内の期限**: {task_info.deadline_in_body}\n")
 
-    markdown += "\n"
+    write("\n")
 
     # プロジェクト情報
-    markdown += "### プロジェクト情報\n"
+    write("### プロジェクト情報\n")
 
-    if task_info["start_date"]:
-        markdown += f"- **開始日**: {task_info['start_date']}\n"
+    if task_info.start_date:
+        write(f"- **開始日**: {task_info.start_date}\n")
 
-    if task_info["end_date"]:
-        markdown += f"- **終了日**: {task_info['end_date']}\n"
+    if task_info.end_date:
+        write(f"- **終了日**: {task_info.end_date}\n")
 
-    markdown += f"- **期限切れ**: {task_info['is_overdue']}\n"
+    write(f"- **期限切れ**: {task_info.is_overdue}\n")
 
-    return markdown
 
+def extract_first_line(body):
+    """Issue本文から意味のある最初の行を抽出する関数
 
-def generate_tasks_markdown(tasks):
-    """タスク一覧のマークダウンを生成する関数
+    空行と見出し（#で始まる行）を読み飛ばします。本文全体を行に分割せず、
+    見つかった時点で走査を終えます。
 
     Args:
-        tasks (list): タスク情報のリスト
+        body (str): Issue本文
 
     Returns:
-        str: マークダウン形式のタスク一覧
+        str: 前後の空白を除いた最初の行（見つからない場合は空文字列）
     """
-    markdown = "# GitHub Project タスク一覧\n\n"
+    start = 0
+    while start <= len(body):
+        end = body.find("\n", start)
+        if end == -1:
+            end = len(body)
 
-    for i, task in enumerate(tasks, 1):
-        markdown += format_task_to_markdown(task, i)
+        line = body[start:end].strip()
+        if line and not line.startswith("#"):
+            return line
 
-        # 最後のタスク以外は区切り線を追加
-        if i < len(tasks):
-            markdown += "\n"
+        start = end + 1
 
-    return markdown
+    return ""
 
 
-def write_to_file(content, file_path):
-    """ファイルに書き込む関数
+def generate_tasks_markdown(tasks, out_file):
+    """タスク一覧のマークダウンを生成してファイルに書き込む関数
+
+    タスク一覧全体やタスクごとの文字列を作らず、ファイルに直接書き込みます。
 
     Args:
-        content (str): 書き込む内容
+        tasks (list): タスク情報のリスト
+        out_file (io.TextIOBase): 書き込み先のファイルオブジェクト
+    """
+    write = out_file.write
+    write("# GitHub Project タスク一覧\n\n")
+
+    for i, task in enumerate(tasks, 1):
+        # 2件目以降はタスクの前に区切りを追加（最後のタスクの後には付けない）
+        if i > 1:
+            write("\n")
+        format_task_to_markdown(task, i, out_file)
+
+
+def write_to_file(tasks, file_path):
+    """タスク一覧をファイルに書き込む関数
+
+    Args:
+        tasks (list): タスク情報のリスト
         file_path (str): ファイルパス
     """
     # ディレクトリが存在しない場合は作成
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
     print(f"ファイルに書き込みます: {file_path}")
-    print(f"ファイルパスの絶対パス: {os.path.abspath(file_path)}")
-    print(f"ディレクトリが存在するか: {os.path.exists(os.path.dirname(file_path))}")
 
     try:
         with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
+            generate_tasks_markdown(tasks, f)
         print(f"ファイルの書き込みが完了しました: {file_path}")
-        print(f"ファイルが存在するか: {os.path.exists(file_path)}")
     except Exception as e:
         print(f"ファイルの書き込み中にエラーが発生しました: {e}")
         raise
@@ -447,24 +737,23 @@ def main():
 
         # プロジェクトのタスク情報を取得
         print("GitHubプロジェクトからタスク情報を取得しています...")
-        project_items = fetch_project_tasks(env_vars)
-        print(f"{len(project_items)}件のタスクを取得しました。")
-
-        # タスク情報を抽出
-        tasks = []
-        for item in project_items:
-            task_info = extract_task_info(item)
-            if task_info:
-                tasks.append(task_info)
+        # 取得したページごとにすぐタスク情報を抽出し、レスポンス全体は保持しない
+        today = datetime.date.today()
+        cache = load_cache()
+        tasks, item_count = extract_tasks(fetch_project_tasks(env_vars), today, cache)
 
+        print(f"{item_count}件のタスクを取得しました。")
         print(f"{len(tasks)}件のタスク情報を抽出しました。")
 
-        # マークダウンを生成
-        markdown = generate_tasks_markdown(tasks)
-
-        # ファイルに書き込む
+        # マークダウンを生成してファイルに書き込む
         file_path = "docs/tasks.md"
-        write_to_file(markdown, file_path)
+        write_to_file(tasks, file_path)
+
+        # 次回の実行のためにIssue本文の解析結果を保存（保存できなくてもタスク一覧の更新は成功とする）
+        try:
+            save_cache(tasks)
+        except OSError as e:
+            print(f"警告: キャッシュを保存できませんでした: {e}")
 
         print(f"タスク一覧を {file_path} に書き込みました。")
 